@@ -62,12 +62,14 @@ ds = {
     },
 }
 #Then in your top‐level script you could do:
-stats_runner = Stats(ds, shots=10**5)
-df = stats_runner.run()
-df_display = df.reset_index()
-print(df_display)
-stats_runner.save_to_csv(df, "ssp_benchmark_results.csv")
-t_df=stats_runner.run_transpiled()
-tdf_display=t_df.reset_index()
-print(tdf_display)
-stats_runner.save_transpiled_to_csv(t_df,"ssp_transpiled_benchmark_results.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    # Stats runs instances in worker processes, so keep the entry point guarded
+    stats_runner = Stats(ds, shots=10**5)
+    df = stats_runner.run()
+    df_display = df.reset_index()
+    print(df_display)
+    stats_runner.save_to_csv(df, "ssp_benchmark_results.csv")
+    t_df=stats_runner.run_transpiled()
+    tdf_display=t_df.reset_index()
+    print(tdf_display)
+    stats_runner.save_transpiled_to_csv(t_df,"ssp_transpiled_benchmark_results.csv")
\ No newline at end of file
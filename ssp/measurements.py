@@ -2,22 +2,28 @@ from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister,transpile
 from qiskit_ibm_runtime import SamplerV2
 from qiskit_ibm_runtime.fake_provider import FakeManilaV2
 from qiskit_aer import AerSimulator, QasmSimulator
-from typing import List, Dict, Tuple
+import numpy as np
+from typing import List, Dict, Tuple, Optional
 
 from solver import DGSSPSolver
 
+# Shared simulator; shots are passed per run() call. Truncation is disabled
+# so that every circuit is simulated on its full width.
+_SIM = AerSimulator(method="statevector", enable_truncation=False, max_parallel_threads=0)
+
 class Results:
-    def __init__(self, qc: QuantumCircuit, shots: int):
+    def __init__(self, qc: QuantumCircuit, shots: int, simulator: Optional[AerSimulator] = None):
         self.qc = qc
         self.shots = shots
+        self.simulator = simulator if simulator is not None else _SIM
 
     def simulate(self) -> Dict[str, int]:
         """
         Run the circuit (self.qc) on AerSimulator and return the counts dictionary.
         """
-        simulator = AerSimulator(shots=self.shots)
-        transpiled = transpile(self.qc, simulator)
-        result = simulator.run(transpiled).result()
+        simulator = self.simulator
+        transpiled = transpile(self.qc, simulator, optimization_level=0)
+        result = simulator.run(transpiled, shots=self.shots).result()
         counts = result.get_counts()
         return counts 
 
@@ -31,25 +37,25 @@ class Results:
         Given a Qiskit counts dict, reconstruct those subsets of A whose
         bit‐pattern measurement sums to t. Returns a list of (subset, probability).
         """
-        total_shots = sum(counts.values())
+        states = list(counts.keys())
+        raw_counts = np.fromiter(counts.values(), dtype=np.int64, count=len(states))
+        total_shots = int(raw_counts.sum())
+
+        # Decode every bitstring at once. Qiskit bitstrings are MSB-first,
+        # so bit i of the integer value is the measurement of index qubit i.
+        values = np.fromiter((int(state, 2) for state in states), dtype=np.int64, count=len(states))
+        bits = (values[:, None] >> np.arange(len(A))) & 1
+        matches = bits @ np.asarray(A, dtype=np.int64) == t
 
-        # Sort (bitstring → raw count) pairs by descending count
-        sorted_items = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+        # Only the matching bitstrings are sorted, by descending count
+        idx = np.flatnonzero(matches)
+        idx = idx[np.argsort(-raw_counts[idx], kind="stable")]
 
         answer_subsets = []
-        for state, raw_count in sorted_items:
-            # 'state' is e.g. '010' if n_ind=3. We want LSB-first,
-            # so reverse the entire string.
-            subset_qubits = list(reversed(state))  
-
-            # Build the subset of A where the measured bit == '1'
-            subset = [A[i] for i, bit in enumerate(subset_qubits) if bit == '1']
-
-            if sum(subset) == t:
-                probability = raw_count / total_shots
-                answer_subsets.append((subset, probability))
-            # Don’t break—lower‐count bitstrings might also sum to t
-            # else:
-            #     continue
-
-        return answer_subsets
\ No newline at end of file
+        for i in idx:
+            # Build the subset of A where the measured bit == 1
+            subset = [A[k] for k in np.flatnonzero(bits[i])]
+            probability = int(raw_counts[i]) / total_shots
+            answer_subsets.append((subset, probability))
+
+        return answer_subsets
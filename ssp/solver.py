@@ -8,8 +8,16 @@ from qiskit_aer import AerSimulator, QasmSimulator
 
 import pandas as pd
 import numpy as np
+from functools import cached_property, lru_cache
 from typing import List, Dict, Tuple
 
+@lru_cache(maxsize=None)
+def _qft_pair(n: int) -> Tuple[Gate, Gate]:
+    """QFT and inverse-QFT gates on n qubits, shared by every solver with the same n_sum."""
+    qft = QFT(n, do_swaps=False).to_gate(label="QFT")
+    iqft = QFT(n, do_swaps=False).inverse().to_gate(label="iQFT")
+    return qft, iqft
+
 class DGSSPSolver:
     """
     Draper‐Grover Subset‐Sum solver.
@@ -21,61 +29,84 @@ class DGSSPSolver:
         self.t = t
         self.assembly_type=assembly_type
 
+        self._A_np = np.asarray(A, dtype=np.int64)
+
         # compute negative/positive sums correctly
-        self.sum_neg = sum(a for a in A if a < 0)
-        self.sum_pos = sum(a for a in A if a > 0)
+        self.sum_neg = int(self._A_np[self._A_np < 0].sum())
+        self.sum_pos = int(self._A_np[self._A_np > 0].sum())
         self.range_len = self.sum_pos - self.sum_neg + 1
 
         # n_sum must be an integer
         self.n_sum = int(np.ceil(np.log2(self.range_len)))
         self.n_ind = len(self.A)
 
+        # sum-register qubits where t has a 0 bit (flipped around the oracle)
+        self._zero_bits = [j for j in range(self.n_sum) if ((self.t >> j) & 1) == 0]
+
         # prebuild QFT and inverse-QFT gates on n_sum qubits
-        self.qft = QFT(self.n_sum, do_swaps=False).to_gate(label="QFT")
-        self.iqft = QFT(self.n_sum, do_swaps=False).inverse().to_gate(label="iQFT")
+        self.qft, self.iqft = _qft_pair(self.n_sum)
 
     def instance(self):
         return (self.A,self.t)
 
     def sum_gate(self) -> Gate:
         """Controlled‐phase adder for A into the sum register."""
-        ind = QuantumRegister(self.n_ind, name="i")
-        summ = QuantumRegister(self.n_sum, name="s")
-        qc = QuantumCircuit(ind, summ, name="SumGate")
-        modulus = 2 ** self.n_sum
-
-        for k, a in enumerate(self.A):
-            a_mod = a % modulus
-            for j in range(self.n_sum):
-                phi = (2 * np.pi * a_mod) / (2 ** (j + 1))
-                qc.cp(phi, ind[k], summ[j])
-
-        return qc.to_gate(label="SumGate")
+        return self._sum_gate
 
     def sub_gate(self) -> Gate:
         """Controlled‐phase subtractor for A from the sum register."""
+        return self._sub_gate
+
+    def oracle_gate(self) -> Gate:
+        """Phase oracle that flips phase of |s⟩ = |t⟩."""
+        return self._oracle_gate
+
+    def grover_diffuser(self) -> Gate:
+        """Standard n_ind-qubit Grover diffuser on the index register."""
+        return self._diffuser
+
+    def _phase_matrix(self, values: np.ndarray) -> np.ndarray:
+        """
+        (n_ind, n_sum) matrix of controlled-phase angles 2*pi*v / 2^(j+1),
+        reduced mod 2*pi. Angles that are a multiple of 2*pi are set to 0,
+        since the corresponding cp gate is the identity.
+        """
+        denoms = 2.0 ** np.arange(1, self.n_sum + 1)
+        phis = np.mod(2 * np.pi * np.outer(values, 1.0 / denoms), 2 * np.pi)
+        phis[(phis < 1e-12) | (phis > 2 * np.pi - 1e-12)] = 0.0
+        return phis
+
+    # The gates below are built once per solver and shared by every
+    # assembly() / solve() call.
+    @cached_property
+    def _sum_gate(self) -> Gate:
         ind = QuantumRegister(self.n_ind, name="i")
         summ = QuantumRegister(self.n_sum, name="s")
-        qc = QuantumCircuit(ind, summ, name="SubGate")
+        qc = QuantumCircuit(ind, summ, name="SumGate")
         modulus = 2 ** self.n_sum
 
-        for k, a in enumerate(self.A):
-            neg = (-a) % modulus
-            for j in range(self.n_sum):
-                phi = (2 * np.pi * neg) / (2 ** (j + 1))
-                qc.cp(phi, ind[k], summ[j])
+        phis = self._phase_matrix(self._A_np % modulus)
+        for k, j in zip(*np.nonzero(phis)):
+            qc.cp(float(phis[k, j]), ind[k], summ[j])
 
-        return qc.to_gate(label="SubGate")
+        return qc.to_gate(label="SumGate")
 
-    def oracle_gate(self) -> Gate:
-        """Phase oracle that flips phase of |s⟩ = |t⟩."""
+    @cached_property
+    def _sub_gate(self) -> Gate:
+        # In the QFT basis, subtracting A is exactly the adjoint of adding it.
+        gate = self._sum_gate.inverse()
+        gate.name = "SubGate"
+        gate.label = "SubGate"
+        return gate
+
+    @cached_property
+    def _oracle_gate(self) -> Gate:
         summ = QuantumRegister(self.n_sum, name="s")
         qc = QuantumCircuit(summ, name="OracleGate")
 
-        # flip the bits where t has a 0
-        for j in range(self.n_sum):
-            if ((self.t >> j) & 1) == 0:
-                qc.x(summ[j])
+        # flip the bits where t has a 0 (none if every bit of t is set)
+        if self._zero_bits:
+            qc.x([summ[j] for j in self._zero_bits])
 
         # multi-controlled Z via H–MCX–H
         qc.h(summ[-1])
@@ -83,21 +114,19 @@ class DGSSPSolver:
         qc.h(summ[-1])
 
         # unflip
-        for j in range(self.n_sum):
-            if ((self.t >> j) & 1) == 0:
-                qc.x(summ[j])
+        if self._zero_bits:
+            qc.x([summ[j] for j in self._zero_bits])
 
         return qc.to_gate(label="OracleGate")
 
-    def grover_diffuser(self) -> Gate:
-        """Standard n_ind-qubit Grover diffuser on the index register."""
+    @cached_property
+    def _diffuser(self) -> Gate:
         ind = QuantumRegister(self.n_ind, name="i")
         qc = QuantumCircuit(ind, name="GroverDiffuser")
 
         # H–X on all
-        for qb in ind:
-            qc.h(qb)
-            qc.x(qb)
+        qc.h(ind[:])
+        qc.x(ind[:])
 
         # multi-controlled Z
         qc.h(ind[-1])
@@ -105,12 +134,15 @@ class DGSSPSolver:
         qc.h(ind[-1])
 
         # X–H on all
-        for qb in ind:
-            qc.x(qb)
-            qc.h(qb)
+        qc.x(ind[:])
+        qc.h(ind[:])
 
         return qc.to_gate(label="GroverDiffuser")
 
+    @cached_property
+    def _step_gate(self) -> Gate:
+        return self.assembly().to_gate(label="DGSSP_Step")
+
     def assembly(self) -> QuantumCircuit:
         """
         There are two type of assembly options.
@@ -124,15 +156,15 @@ class DGSSPSolver:
         if self.assembly_type=='FullQFT':
             # add
             qc.append(self.qft, summ[:])
-            qc.append(self.sum_gate(), ind[:] + summ[:])
+            qc.append(self._sum_gate, ind[:] + summ[:])
             qc.append(self.iqft, summ[:])
 
             # oracle
-            qc.append(self.oracle_gate(), summ[:])
+            qc.append(self._oracle_gate, summ[:])
 
             # subtract
             qc.append(self.qft, summ[:])
-            qc.append(self.sub_gate(), ind[:] + summ[:])
+            qc.append(self._sub_gate, ind[:] + summ[:])
             qc.append(self.iqft, summ[:])
 
             return qc
@@ -140,25 +172,27 @@ class DGSSPSolver:
         elif self.assembly_type=='HalfQFT':
             # add
             qc.h(summ[:])
-            qc.append(self.sum_gate(), ind[:] + summ[:])
+            qc.append(self._sum_gate, ind[:] + summ[:])
             qc.append(self.iqft, summ[:])
 
             # oracle
-            qc.append(self.oracle_gate(), summ[:])
+            qc.append(self._oracle_gate, summ[:])
 
             # subtract
-            qc.append(self.iqft, summ[:]).inverse()
-            qc.append(self.sub_gate(), ind[:] + summ[:])
+            qc.append(self.qft, summ[:])
+            qc.append(self._sub_gate, ind[:] + summ[:])
             qc.h(summ[:])
 
             return qc
         else:
             return qc
 
-    def solve(self, iterations: int) -> QuantumCircuit:
+    def solve(self, iterations: int, add_barriers: bool = True) -> QuantumCircuit:
         """
         Build the full Grover circuit and measure indices.
         Returns a QuantumCircuit ready to run (with measurements).
+        Barriers only help when drawing the circuit; pass add_barriers=False
+        to let the transpiler optimize across iteration boundaries.
         """
         ind = QuantumRegister(self.n_ind, name="i")
         summ = QuantumRegister(self.n_sum, name="s")
@@ -167,16 +201,19 @@ class DGSSPSolver:
 
         # initialize index register
         qc.h(ind)
-        qc.barrier()
+        if add_barriers:
+            qc.barrier()
 
         # Grover iterations
-        step_gate = self.assembly().to_gate(label="DGSSP_Step")
-        diffuser = self.grover_diffuser()
+        step_gate = self._step_gate
+        diffuser = self._diffuser
         for _ in range(iterations):
             qc.append(step_gate, ind[:] + summ[:])
-            qc.barrier()
+            if add_barriers:
+                qc.barrier()
             qc.append(diffuser, ind[:])
-            qc.barrier()
+            if add_barriers:
+                qc.barrier()
 
         # measurement
         qc.measure(ind, creg)
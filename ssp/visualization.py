@@ -1,5 +1,65 @@
+import os
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+# Plots are only written to files; the non-interactive backend avoids
+# importing and initializing a GUI toolkit.
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from typing import Callable, List, Optional, Union
+
+# Simplify line paths as much as possible when rendering
+matplotlib.rcParams["path.simplify_threshold"] = 1.0
+
+
+# Columns that describe a benchmark row; every other column is a gate count
+METADATA_COLS = frozenset({
+    "size", "instance_id", "assembly_type",
+    "num_qubits", "num_clbits", "depth", "width", "circuit_size"
+})
+# Circuit metrics that are plotted alongside the gate counts
+METRIC_COLS = ["size", "num_qubits", "depth", "width", "circuit_size"]
+# Basis gates compared in the selected-gates plots
+SELECTED_GATES = ["ecr", "rz", "sx", "x"]
+# Columns read by each plot (see Plots.load_for); the gate-count histograms
+# additionally need every gate-count column.
+REQUIRED_FOR = {
+    "transpiled_stats": ["size", "assembly_type", "num_qubits", "depth", "width", "circuit_size"],
+    "gate_counts_histogram": ["size", "assembly_type"],
+    "selected_gates_vs_size": ["size", "assembly_type", *SELECTED_GATES],
+    "transpiled_stats_vs_num_qubits": ["size", "assembly_type", "num_qubits", "depth", "width", "circuit_size"],
+    "gate_counts_histogram_vs_num_qubits": ["size", "assembly_type", "num_qubits"],
+    "selected_gates_vs_num_qubits": ["size", "assembly_type", "num_qubits", *SELECTED_GATES],
+}
+GATE_COUNT_PLOTS = frozenset({"gate_counts_histogram", "gate_counts_histogram_vs_num_qubits"})
+# Output file written by each plot method in plot_all()
+REPORT_FILES = {
+    "plot_transpiled_stats": "stats_vs_size.png",
+    "plot_gate_counts_histogram": "histogram_vs_size.png",
+    "plot_selected_gates_vs_size": "selected_gates_vs_size.png",
+    "plot_transpiled_stats_vs_num_qubits": "stats_vs_num_qubits.png",
+    "plot_gate_counts_histogram_vs_num_qubits": "histogram_vs_num_qubits.png",
+    "plot_selected_gates_vs_num_qubits": "selected_gates_vs_num_qubits.png",
+}
+
+
+def _group_sums(codes: np.ndarray, X: np.ndarray, ngroups: int) -> tuple:
+    """
+    Per-group column sums and non-NaN counts of X in one pass over each column,
+    where codes[i] in [0, ngroups) is the group of row i. NaNs are skipped, as
+    in pandas' groupby().mean().
+    """
+    valid = ~np.isnan(X)
+    X = np.where(valid, X, 0.0)
+    sums = np.column_stack([np.bincount(codes, weights=X[:, j], minlength=ngroups) for j in range(X.shape[1])])
+    counts = np.column_stack([np.bincount(codes, weights=valid[:, j], minlength=ngroups) for j in range(X.shape[1])])
+    return sums, counts
+
+def _render_one(plots: "Plots", method: str, output_png: str) -> None:
+    """Run one plot method of plots; used by Plots.render_all in worker processes."""
+    getattr(plots, method)(output_png)
 
 
 class Plots:
@@ -15,24 +75,225 @@ class Plots:
         """
         self.csv_path = csv_path
         self.df = None
-
-    def load_data(self) -> pd.DataFrame:
+        self.gate_cols = None
+        self.assembly_types = None
+        # Figures reused across plots, keyed by subplot grid (see _figure)
+        self._figures = {}
+
+    def __getstate__(self) -> dict:
+        # Figures are not sent to render_all workers; each worker builds its own
+        state = self.__dict__.copy()
+        state["_figures"] = {}
+        return state
+
+    def close(self) -> None:
+        """Releases the figures kept for reuse between plots."""
+        self._figures.clear()
+
+    def load_data(self, usecols: Optional[Union[List[str], Callable[[str], bool]]] = None) -> pd.DataFrame:
         """
         Reads the CSV file into a pandas DataFrame and returns it.
+        'assembly_type' is read as a categorical, integer gate counts as int16
+        where they fit and the remaining integer columns as int32.
+
+        Args:
+            usecols: Optional subset of columns to read, passed to pd.read_csv
+                (a list of names or a predicate on the name). None reads all.
 
         Returns:
             A DataFrame containing the transpiled benchmark results, with columns:
             ['size', 'instance_id', 'assembly_type', 'num_qubits', 'num_clbits',
              'depth', 'width', 'circuit_size', ...basis gate counts...]
         """
-        df = pd.read_csv(self.csv_path)
+        # assembly_type is categorical so that grouping hashes integer codes;
+        # every groupby on it passes observed=True to skip unused categories.
+        df = pd.read_csv(self.csv_path, usecols=usecols, dtype={"assembly_type": "category"})
         # Ensure 'size' and 'assembly_type' are present
         expected_cols = {"size", "assembly_type"}
         if not expected_cols.issubset(set(df.columns)):
             raise ValueError(f"CSV missing required columns: {expected_cols - set(df.columns)}")
+
+        # Gate-count columns are every numeric non-metadata column; run() CSVs
+        # also carry e.g. a string 'solutions' column, which is not aggregated
+        gate_cols = df.drop(columns=METADATA_COLS & set(df.columns)).select_dtypes("number").columns.tolist()
+
+        # Metrics are small integers; integer gate counts are narrowed to int16
+        # only where they fit, since astype would silently wrap larger counts.
+        # Float columns (e.g. gate counts with missing values) are left as read.
+        int_cols = df.select_dtypes("int64").columns
+        df[int_cols] = df[int_cols].astype("int32")
+        int16_max = np.iinfo(np.int16).max
+        small_cols = [col for col in gate_cols if col in int_cols and df[col].max() <= int16_max]
+        df[small_cols] = df[small_cols].astype("int16")
+
         self.df = df
+        self.assembly_types = list(df["assembly_type"].cat.categories)
+        self.gate_cols = gate_cols
+        # Drop aggregates computed from previously loaded data
+        for name in (
+            "_sums_and_counts", "_agg_by_size", "_agg_by_qubits",
+            "_wide_by_size", "_wide_by_qubits", "_gates_by_size", "_gates_by_qubits",
+        ):
+            self.__dict__.pop(name, None)
         return df
 
+    def load_for(self, *plots: str) -> pd.DataFrame:
+        """
+        Loads only the columns needed by the given plots, in a single read.
+
+        Args:
+            plots: Keys of REQUIRED_FOR, e.g. "transpiled_stats". With no
+                arguments, the columns of every plot are read.
+        """
+        plots = plots or tuple(REQUIRED_FOR)
+        required = set().union(*(REQUIRED_FOR[name] for name in plots))
+        if GATE_COUNT_PLOTS.intersection(plots):
+            return self.load_data(usecols=lambda col: col in required or col not in METADATA_COLS)
+        return self.load_data(usecols=lambda col: col in required)
+
+    # Aggregates are computed on first use and shared by every plot method.
+    @cached_property
+    def _sums_and_counts(self) -> tuple:
+        """
+        Sums and non-NaN counts of every loaded metric and gate-count column, per
+        (size, num_qubits, assembly_type). This is the only full scan of the
+        data; both mean aggregates are rolled up from it.
+        """
+        keys = [col for col in ("size", "num_qubits") if col in self.df.columns] + ["assembly_type"]
+        values = [col for col in METRIC_COLS if col in self.df.columns] + self.gate_cols
+
+        # Integer group codes for every row, then plain NumPy reductions
+        codes, groups = pd.MultiIndex.from_frame(self.df[keys]).factorize(sort=True)
+        groups = groups.set_names(keys)
+        sums, counts = _group_sums(codes, self.df[values].to_numpy(np.float64), len(groups))
+        return pd.DataFrame(sums, index=groups, columns=values), pd.DataFrame(counts, index=groups, columns=values)
+
+    def _rollup(self, key: str) -> pd.DataFrame:
+        """Mean of every metric and gate-count column per (key, assembly_type)."""
+        sums, counts = self._sums_and_counts
+        by = [key, "assembly_type"]
+        # Groups where a column is all NaN get 0 / 0 = NaN, as with mean()
+        means = sums.groupby(level=by, observed=True).sum().div(
+            counts.groupby(level=by, observed=True).sum()
+        )
+        return means.drop(columns=key)
+
+    @cached_property
+    def _agg_by_size(self) -> pd.DataFrame:
+        return self._rollup("size")
+
+    @cached_property
+    def _agg_by_qubits(self) -> pd.DataFrame:
+        return self._rollup("num_qubits")
+
+    # Line plots read the means pivoted to one column per assembly_type:
+    # columns are (metric, assembly_type), so [metric] is ready to plot.
+    @cached_property
+    def _wide_by_size(self) -> pd.DataFrame:
+        return self._agg_by_size.unstack("assembly_type")
+
+    @cached_property
+    def _wide_by_qubits(self) -> pd.DataFrame:
+        return self._agg_by_qubits.unstack("assembly_type")
+
+    # Histograms read the gate-count means indexed by (assembly_type, key),
+    # so each subplot is a contiguous .loc[asm] slice.
+    @cached_property
+    def _gates_by_size(self) -> pd.DataFrame:
+        return self._agg_by_size[self.gate_cols].swaplevel().sort_index().astype("float32")
+
+    @cached_property
+    def _gates_by_qubits(self) -> pd.DataFrame:
+        return self._agg_by_qubits[self.gate_cols].swaplevel().sort_index().astype("float32")
+
+    def _figure(self, nrows: int, ncols: int, figsize: tuple, sharex: bool = False, sharey: bool = False) -> tuple:
+        """
+        Figure and flattened axes for a subplot grid. The figure is created on
+        first use and cleared on later ones, so plots with the same grid (the
+        size and num_qubits variants of each plot) draw on the same canvas.
+        """
+        key = (nrows, ncols, figsize, sharex, sharey)
+        if key not in self._figures:
+            fig = Figure(figsize=figsize, layout="constrained")
+            axes = fig.subplots(nrows, ncols, sharex=sharex, sharey=sharey, squeeze=False)
+            self._figures[key] = (fig, axes.flatten())
+        fig, axes = self._figures[key]
+        for ax in axes:
+            ax.clear()
+            # Constrained layout starts from the current positions; reset them
+            # so a reused figure is laid out exactly like a new one
+            ax.set_subplotspec(ax.get_subplotspec())
+        return fig, axes
+
+    @staticmethod
+    def _plot_gate_bars(ax, pivot: pd.DataFrame) -> None:
+        """
+        Grouped bar chart of pivot (index = x values, one column per gate):
+        one ax.bar call per gate, colored along the tab20 colormap.
+        """
+        x = np.arange(len(pivot.index))
+        values = pivot.to_numpy()
+        width = 0.8 / values.shape[1]
+        colors = matplotlib.colormaps["tab20"](np.linspace(0, 1, values.shape[1]))
+        for j, (col, color) in enumerate(zip(pivot.columns, colors)):
+            ax.bar(x - 0.4 + width * (j + 0.5), values[:, j], width, label=col, color=color)
+        ax.set_xticks(x, pivot.index, rotation=90)
+        ax.set_xlim(-0.5, len(x) - 0.5)
+
+    @staticmethod
+    def _plot_lines(ax, grouped: pd.DataFrame, xlabel: str) -> None:
+        """
+        Line chart of grouped (index = x values, one column per assembly_type),
+        all columns drawn by a single ax.plot call on the 2D value array.
+        """
+        lines = ax.plot(grouped.index.values, grouped.values, marker="o")
+        ax.legend(lines, grouped.columns.tolist(), title=grouped.columns.name)
+        # Like pandas, label shared axes only on the outer subplots
+        spec = ax.get_subplotspec()
+        if spec.is_last_row() or len(ax.get_shared_x_axes().get_siblings(ax)) == 1:
+            ax.set_xlabel(xlabel)
+        if not spec.is_first_col() and len(ax.get_shared_y_axes().get_siblings(ax)) > 1:
+            ax.set_ylabel("")
+
+    def plot_all(self, out_dir: str) -> None:
+        """
+        Generates every plot into out_dir, using the file names in REPORT_FILES.
+
+        Args:
+            out_dir: Existing directory where the PNG files will be saved.
+        """
+        for method, filename in REPORT_FILES.items():
+            getattr(self, method)(os.path.join(out_dir, filename))
+
+    def render_all(self, out_dir: str, max_workers: Optional[int] = None) -> None:
+        """
+        Same output as plot_all(), but each plot is rendered in its own worker
+        process. The aggregates are computed once here, before this object is
+        pickled to the workers, so workers only draw.
+
+        Args:
+            out_dir: Existing directory where the PNG files will be saved.
+            max_workers: Number of worker processes; None uses every available CPU.
+        """
+        if self.df is None:
+            raise RuntimeError("Data not loaded. Call load_data() before plotting.")
+
+        # Warm the cached aggregates that are valid for the loaded columns
+        self._wide_by_size
+        self._gates_by_size
+        if "num_qubits" in self.df.columns:
+            self._wide_by_qubits
+            self._gates_by_qubits
+
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = [
+                ex.submit(_render_one, self, method, os.path.join(out_dir, filename))
+                for method, filename in REPORT_FILES.items()
+            ]
+            # Re-raise the first error from any worker
+            for future in futures:
+                future.result()
+
     def plot_transpiled_stats(self, output_png: str) -> None:
         """
         For each assembly_type (FullQFT vs HalfQFT), plots:
@@ -49,41 +310,26 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
         # We expect columns: 'size', 'assembly_type', 'num_qubits', 'depth', 'width', 'circuit_size'
         metrics = ["num_qubits", "depth", "width", "circuit_size"]
-        assembly_types = df["assembly_type"].unique()
 
         # Prepare subplots: 2 rows x 2 columns
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True)
-        axes = axes.flatten()  # flatten to iterate easily
+        fig, axes = self._figure(2, 2, (12, 8), sharex=True)
 
         for idx, metric in enumerate(metrics):
             ax = axes[idx]
             ax.set_title(f"{metric.replace('_', ' ').title()} vs Size")
-            ax.set_xlabel("Size")
             ax.set_ylabel(metric.replace("_", " ").title())
 
-            # Group by size and assembly_type, then take mean of the metric
-            grouped = df.groupby(["size", "assembly_type"])[metric].mean().unstack("assembly_type")
-
-            # Plot each assembly_type on the same axes
-            for asm in assembly_types:
-                if asm in grouped.columns:
-                    ax.plot(
-                        grouped.index,
-                        grouped[asm],
-                        marker="o",
-                        label=asm
-                    )
+            # Mean of the metric per size and assembly_type
+            grouped = self._wide_by_size[metric]
 
-            ax.legend()
+            # Plot every assembly_type on the same axes in one call
+            self._plot_lines(ax, grouped, "Size")
             ax.grid(True)
 
-        # Adjust layout and save to PNG
-        plt.tight_layout()
-        plt.savefig(output_png)
-        plt.close(fig)
+        # Save to PNG; constrained layout already arranged the subplots
+        fig.savefig(output_png, dpi=100, metadata={})
     
     def plot_gate_counts_histogram(self, output_png: str) -> None:
         """
@@ -100,33 +346,15 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
+        fig, axes = self._figure(1, 2, (14, 6), sharey=True)
 
-        # Identify gate-count columns by excluding known metadata columns
-        metadata_cols = {
-            "size", "instance_id", "assembly_type",
-            "num_qubits", "num_clbits", "depth", "width", "circuit_size"
-        }
-        gate_cols = [col for col in df.columns if col not in metadata_cols]
-
-        assembly_types = df["assembly_type"].unique()
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharey=True)
-
-        for idx, asm in enumerate(assembly_types):
+        for idx, asm in enumerate(self.assembly_types):
             ax = axes[idx]
-            subset = df[df["assembly_type"] == asm]
-
-            # Group by size and average each gate count across instances
-            pivot = subset.groupby("size")[gate_cols].mean()
+            # Average of each gate count across instances, per size
+            pivot = self._gates_by_size.loc[asm]
 
             # Create a grouped bar chart
-            pivot.plot(
-                kind="bar",
-                ax=ax,
-                colormap="tab20",
-                width=0.8,
-                legend=(idx == 1)  # show legend only on the right subplot
-            )
+            self._plot_gate_bars(ax, pivot)
 
             ax.set_title(f"{asm} ‐ Gate Counts by Size")
             ax.set_xlabel("Size")
@@ -141,9 +369,7 @@ class Plots:
             title="Basis Gates"
         )
 
-        plt.tight_layout()
-        plt.savefig(output_png)
-        plt.close(fig)
+        fig.savefig(output_png, dpi=100, metadata={})
 
     def plot_selected_gates_vs_size(self, output_png: str) -> None:
         """
@@ -158,41 +384,26 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
-        selected_gates = ["ecr", "rz", "sx", "x"]
-        assembly_types = df["assembly_type"].unique()
+        df = self.df
 
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True, sharey=True)
-        axes = axes.flatten()
+        fig, axes = self._figure(2, 2, (12, 8), sharex=True, sharey=True)
 
-        for idx, gate in enumerate(selected_gates):
+        for idx, gate in enumerate(SELECTED_GATES):
             ax = axes[idx]
             ax.set_title(f"{gate.upper()} Count vs Size")
-            ax.set_xlabel("Size")
             ax.set_ylabel("Average Count")
 
             # Ensure gate column exists
             if gate not in df.columns:
                 raise KeyError(f"Gate '{gate}' not found in DataFrame columns.")
 
-            # Group by size and assembly_type, then average the selected gate count
-            grouped = df.groupby(["size", "assembly_type"])[gate].mean().unstack("assembly_type")
-
-            for asm in assembly_types:
-                if asm in grouped.columns:
-                    ax.plot(
-                        grouped.index,
-                        grouped[asm],
-                        marker="o",
-                        label=asm
-                    )
+            # Average of the selected gate count per size and assembly_type
+            grouped = self._wide_by_size[gate]
 
-            ax.legend()
+            self._plot_lines(ax, grouped, "Size")
             ax.grid(True)
 
-        plt.tight_layout()
-        plt.savefig(output_png)
-        plt.close(fig)
+        fig.savefig(output_png, dpi=100, metadata={})
 
     def plot_transpiled_stats_vs_num_qubits(self, output_png: str) -> None:
         """
@@ -202,35 +413,21 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
         # We want to plot num_qubits on x-axis and these metrics on y:
         metrics = ["depth", "width", "circuit_size", "size"]
-        assembly_types = df["assembly_type"].unique()
 
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True)
-        axes = axes.flatten()
+        fig, axes = self._figure(2, 2, (12, 8), sharex=True)
 
         for idx, metric in enumerate(metrics):
             ax = axes[idx]
             ax.set_title(f"{metric.replace('_', ' ').title()} vs Num Qubits")
-            ax.set_xlabel("Num Qubits")
             ax.set_ylabel(metric.replace("_", " ").title())
 
-            grouped = df.groupby(["num_qubits", "assembly_type"])[metric].mean().unstack("assembly_type")
-            for asm in assembly_types:
-                if asm in grouped.columns:
-                    ax.plot(
-                        grouped.index,
-                        grouped[asm],
-                        marker="o",
-                        label=asm
-                    )
-
-            ax.legend()
+            grouped = self._wide_by_qubits[metric]
+            self._plot_lines(ax, grouped, "Num Qubits")
             ax.grid(True)
 
-        plt.tight_layout()
-        plt.savefig(output_png)
+        fig.savefig(output_png, dpi=100, metadata={})
 
     def plot_gate_counts_histogram_vs_num_qubits(self, output_png: str) -> None:
         """
@@ -240,28 +437,13 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
-        metadata_cols = {
-            "size", "instance_id", "assembly_type",
-            "num_qubits", "num_clbits", "depth", "width", "circuit_size"
-        }
-        gate_cols = [col for col in df.columns if col not in metadata_cols]
+        fig, axes = self._figure(1, 2, (14, 6), sharey=True)
 
-        assembly_types = df["assembly_type"].unique()
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharey=True)
-
-        for idx, asm in enumerate(assembly_types):
+        for idx, asm in enumerate(self.assembly_types):
             ax = axes[idx]
-            subset = df[df["assembly_type"] == asm]
-            pivot = subset.groupby("num_qubits")[gate_cols].mean()
+            pivot = self._gates_by_qubits.loc[asm]
 
-            pivot.plot(
-                kind="bar",
-                ax=ax,
-                colormap="tab20",
-                width=0.8,
-                legend=(idx == 1)
-            )
+            self._plot_gate_bars(ax, pivot)
 
             ax.set_title(f"{asm} ‐ Gate Counts by Num Qubits")
             ax.set_xlabel("Num Qubits")
@@ -276,9 +458,7 @@ class Plots:
             title="Basis Gates"
         )
 
-        plt.tight_layout()
-        plt.savefig(output_png)
-        plt.close(fig)
+        fig.savefig(output_png, dpi=100, metadata={})
 
     def plot_selected_gates_vs_num_qubits(self, output_png: str) -> None:
         """
@@ -289,36 +469,21 @@ class Plots:
         if self.df is None:
             raise RuntimeError("Data not loaded. Call load_data() before plotting.")
 
-        df = self.df.copy()
-        selected_gates = ["ecr", "rz", "sx", "x"]
-        assembly_types = df["assembly_type"].unique()
+        df = self.df
 
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True, sharey=True)
-        axes = axes.flatten()
+        fig, axes = self._figure(2, 2, (12, 8), sharex=True, sharey=True)
 
-        for idx, gate in enumerate(selected_gates):
+        for idx, gate in enumerate(SELECTED_GATES):
             ax = axes[idx]
             ax.set_title(f"{gate.upper()} Count vs Num Qubits")
-            ax.set_xlabel("Num Qubits")
             ax.set_ylabel("Average Count")
 
             if gate not in df.columns:
                 raise KeyError(f"Gate '{gate}' not found in DataFrame columns.")
 
-            grouped = df.groupby(["num_qubits", "assembly_type"])[gate].mean().unstack("assembly_type")
-
-            for asm in assembly_types:
-                if asm in grouped.columns:
-                    ax.plot(
-                        grouped.index,
-                        grouped[asm],
-                        marker="o",
-                        label=asm
-                    )
+            grouped = self._wide_by_qubits[gate]
 
-            ax.legend()
+            self._plot_lines(ax, grouped, "Num Qubits")
             ax.grid(True)
 
-        plt.tight_layout()
-        plt.savefig(output_png)
-        plt.close(fig)
\ No newline at end of file
+        fig.savefig(output_png, dpi=100, metadata={})
\ No newline at end of file